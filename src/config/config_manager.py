@@ -11,6 +11,9 @@ from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
+# Marks environment variables that were looked up but not set
+_MISSING = object()
+
 
 class ConfigManager:
     """
@@ -20,6 +23,9 @@ class ConfigManager:
     Supports automatic type conversion for boolean and numeric values.
     """
     
+    # .env files already loaded in this process
+    _loaded_env_files: set = set()
+    
     def __init__(self, env_file: Optional[str] = None):
         """
         Initialize the configuration manager.
@@ -29,21 +35,29 @@ class ConfigManager:
         """
         self.env_file = env_file or ".env"
         self.config: Dict[str, Any] = {}
+        self._env_cache: Dict[str, Any] = {}
+        self._flat: Dict[str, Any] = {}
         self._load_config()
     
     def _load_config(self):
         """Load configuration from environment variables."""
-        # Load .env file if it exists
-        if os.path.exists(self.env_file):
-            load_dotenv(self.env_file)
-        else:
-            logger.info(f"Environment file {self.env_file} not found, using system environment variables")
+        # Load .env file if it exists and hasn't been loaded already
+        if self.env_file not in ConfigManager._loaded_env_files:
+            if os.path.exists(self.env_file):
+                load_dotenv(self.env_file)
+                ConfigManager._loaded_env_files.add(self.env_file)
+            else:
+                logger.info(f"Environment file {self.env_file} not found, using system environment variables")
         
         # Start with default configuration
         self.config = self._get_default_config()
         
         # Override with environment variables
         self._load_from_env()
+        
+        # Index every dot-notation path for single-lookup access
+        self._flat = {}
+        self._flatten(self.config, "", self._flat)
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration."""
@@ -54,13 +68,23 @@ class ConfigManager:
             "protocol_version": "2024-11-05",
             "network": {
                 "host": "0.0.0.0",
-                "port": 8081
+                "port": 8081,
+                "yf_workers": 16,
+                "http_pool": 64,
+                "http_timeout": 10
             },
             "logging": {
                 "level": "INFO"
             },
             "debug": {
                 "enabled": False
+            },
+            "cache": {
+                "info_ttl": 60,
+                "history_ttl": 60,
+                "dividends_ttl": 86400,
+                "negative_ttl": 300,
+                "max_entries": 512
             }
         }
     
@@ -70,22 +94,36 @@ class ConfigManager:
             "MCP_LOG_LEVEL": ("logging", "level"),
             "MCP_PORT": ("network", "port"),
             "MCP_HOST": ("network", "host"),
+            "MCP_YF_WORKERS": ("network", "yf_workers"),
+            "MCP_HTTP_POOL": ("network", "http_pool"),
+            "MCP_HTTP_TIMEOUT": ("network", "http_timeout"),
             "MCP_DEBUG": ("debug", "enabled"),
             "MCP_NAME": ("name",),
             "MCP_VERSION": ("version",),
             "MCP_DESCRIPTION": ("description",),
+            "MCP_INFO_TTL": ("cache", "info_ttl"),
+            "MCP_HISTORY_TTL": ("cache", "history_ttl"),
+            "MCP_DIVIDENDS_TTL": ("cache", "dividends_ttl"),
+            "MCP_NEG_TTL": ("cache", "negative_ttl"),
+            "MCP_CACHE_SIZE": ("cache", "max_entries"),
         }
         
         for env_var, config_path in env_mappings.items():
             value = os.getenv(env_var)
             if value:
-                # Handle boolean values
-                if value.lower() in ('true', 'false'):
-                    value = value.lower() == 'true'
-                # Handle numeric values
-                elif value.isdigit():
-                    value = int(value)
-                self._set_nested_value(self.config, config_path, value)
+                self._set_nested_value(self.config, config_path, self._parse_value(value))
+    
+    @staticmethod
+    def _parse_value(value: str) -> Any:
+        """Convert an environment string to a bool or int where possible."""
+        # Handle boolean values
+        if value.lower() in ('true', 'false'):
+            return value.lower() == 'true'
+        # Handle numeric values (including negatives)
+        try:
+            return int(value)
+        except ValueError:
+            return value
     
     def _set_nested_value(self, config: Dict[str, Any], path: tuple, value: Any):
         """Set a nested value in the configuration dictionary."""
@@ -96,6 +134,14 @@ class ConfigManager:
             current = current[key]
         current[path[-1]] = value
     
+    def _flatten(self, config: Dict[str, Any], prefix: str, flat: Dict[str, Any]) -> None:
+        """Map each dot-notation path (sections included) to its value."""
+        for key, value in config.items():
+            path = f"{prefix}{key}"
+            flat[path] = value
+            if isinstance(value, dict):
+                self._flatten(value, f"{path}.", flat)
+    
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get a configuration value.
@@ -107,16 +153,7 @@ class ConfigManager:
         Returns:
             Configuration value
         """
-        keys = key.split('.')
-        current = self.config
-        
-        for k in keys:
-            if isinstance(current, dict) and k in current:
-                current = current[k]
-            else:
-                return default
-        
-        return current
+        return self._flat.get(key, default)
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -131,6 +168,9 @@ class ConfigManager:
         """
         Get a value directly from environment variables.
         
+        Values are parsed on first access and cached for the lifetime of
+        this manager.
+        
         Args:
             key: Environment variable name
             default: Default value if not found
@@ -138,15 +178,11 @@ class ConfigManager:
         Returns:
             Environment variable value with automatic type conversion
         """
-        value = os.getenv(key, default)
+        value = self._env_cache.get(key)
         if value is None:
-            return default
-        
-        # Handle boolean values
-        if isinstance(value, str) and value.lower() in ('true', 'false'):
-            return value.lower() == 'true'
-        # Handle numeric values
-        elif isinstance(value, str) and value.isdigit():
-            return int(value)
+            # Parse each variable once; later lookups are a single dict hit
+            raw = os.getenv(key)
+            value = _MISSING if raw is None else self._parse_value(raw)
+            self._env_cache[key] = value
         
-        return value 
\ No newline at end of file
+        return default if value is _MISSING else value 
\ No newline at end of file
@@ -5,28 +5,27 @@ This module provides a proper MCP server that can be deployed locally or in cont
 and follows the Model Context Protocol specification.
 """
 
-import json
-import logging
-import os
-import platform
-import psutil
-from datetime import datetime, UTC
-from typing import Dict, Any, List
+import asyncio
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Dict, Any, List, Callable, Tuple
 import numpy as np
 import pandas as pd
+import orjson
+from curl_cffi import CurlOpt, requests as curl_requests
 from mcp.server import Server
 from mcp.server.fastmcp import FastMCP
 from mcp.server.sse import SseServerTransport
 from starlette.applications import Starlette
 from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 from starlette.routing import Mount, Route
-from collections import defaultdict, Counter
 import yfinance as yf
-import httpx
-import uvicorn
-import pandas as pd
-import numpy as np
-
 
 from config.config_manager import ConfigManager
 from utils.logging_utils import setup_logging
@@ -40,7 +39,219 @@ config_manager = ConfigManager()
 # Create an MCP server
 mcp = FastMCP("yfinance")
 
+# Series shorter than this use plain NumPy; the JIT kernel only pays off above it
+CORRELATION_JIT_THRESHOLD = 1024
+
+# Cache lifetimes (seconds) for Yahoo Finance lookups; ConfigManager only parses
+# ints, so fractional env values arrive as strings and are converted here
+INFO_TTL = float(config_manager.get("cache.info_ttl", 60))
+HISTORY_TTL = float(config_manager.get("cache.history_ttl", 60))
+DIVIDENDS_TTL = float(config_manager.get("cache.dividends_ttl", 86400))
+NEGATIVE_TTL = float(config_manager.get("cache.negative_ttl", 300))
+
+# Entries kept per cache; tickers come from clients, so the caches must not grow unbounded
+CACHE_MAX_ENTRIES = int(config_manager.get("cache.max_entries", 512))
+
+# Blocking yfinance calls run here so they don't stall the event loop
+_YF_POOL = ThreadPoolExecutor(
+    max_workers=int(config_manager.get("network.yf_workers", 16)),
+    thread_name_prefix="yfinance",
+)
+
+# Connection pool size (per worker thread) and per-request timeout for Yahoo
+HTTP_POOL = int(config_manager.get("network.http_pool", 64))
+HTTP_TIMEOUT = float(config_manager.get("network.http_timeout", 10))
+
+# One browser-impersonating HTTP session shared by every yfinance request, so
+# connections (and their TLS handshakes) are reused across tickers and calls
+_YF_SESSION: curl_requests.Session[curl_requests.Response] = curl_requests.Session(
+    impersonate="chrome",
+    timeout=HTTP_TIMEOUT,
+    curl_options={CurlOpt.MAXCONNECTS: HTTP_POOL},
+)
+
+# Timestamped results keyed by ticker, or (ticker, period, interval) for history,
+# in insertion order so the oldest (and first to expire) entries come first
+_INFO_CACHE: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+_HISTORY_CACHE: "OrderedDict[Tuple[str, str, str], Tuple[float, Any]]" = OrderedDict()
+_DIVIDENDS_CACHE: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+# Batched yf.download histories keyed by (upper-cased ticker, period); kept apart
+# from _HISTORY_CACHE because download returns tz-naive frames without the
+# Dividends/Stock Splits columns that Ticker.history has
+_DOWNLOAD_CACHE: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+
+# Guards cache insertion and eviction, which run on the yfinance worker threads
+_CACHE_LOCK = threading.Lock()
+
+# When each unknown ticker was last looked up, so repeated typos skip the network;
+# bounded and evicted like the caches above (the value slot is unused)
+_NEGATIVE_CACHE: "OrderedDict[str, Tuple[float, None]]" = OrderedDict()
+
+# Info fields of which at least one is set for any real ticker
+_IDENTITY_FIELDS = ("shortName", "longName", "currentPrice", "regularMarketPrice")
+
+# (response key, Yahoo info key) pairs reported for every ticker
+_INFO_FIELDS = (
+    ("name", "shortName"),
+    ("sector", "sector"),
+    ("industry", "industry"),
+    ("market_cap", "marketCap"),
+    ("pe_ratio", "trailingPE"),
+    ("dividend_yield", "dividendYield"),
+    ("52_week_high", "fiftyTwoWeekHigh"),
+    ("52_week_low", "fiftyTwoWeekLow"),
+)
+
+
+class UnknownTickerError(ValueError):
+    """Raised when Yahoo Finance has no data for a ticker symbol."""
+
+
+def _get_ticker(ticker: str) -> yf.Ticker:
+    """Return a new yfinance Ticker for the given symbol on the shared HTTP session.
+
+    Tickers memoize their info and dividends, so one is built per cache load
+    rather than kept around; otherwise an expired entry would be refilled
+    from the same stale object instead of from Yahoo.
+    """
+    return yf.Ticker(ticker, session=_YF_SESSION)
+
+
+def _store(cache: "OrderedDict[Any, Tuple[float, Any]]", key: Any, ttl: float, now: float, value: Any) -> None:
+    """Insert a timestamped value, evicting expired entries and any beyond CACHE_MAX_ENTRIES."""
+    with _CACHE_LOCK:
+        cache.pop(key, None)
+        cache[key] = (now, value)
+        # Entries are in insertion order, so expired ones are all at the front
+        while cache:
+            oldest = next(iter(cache.values()))
+            if len(cache) <= CACHE_MAX_ENTRIES and now - oldest[0] < ttl:
+                break
+            cache.popitem(last=False)
+
+
+def _cached(cache: "OrderedDict[Any, Tuple[float, Any]]", key: Any, ttl: float, loader: Callable[[], Any]) -> Any:
+    """Return the cached value for key, calling loader if it is missing or older than ttl."""
+    now = time.monotonic()
+    entry = cache.get(key)
+    if entry is not None and now - entry[0] < ttl:
+        return entry[1]
+    value = loader()
+    _store(cache, key, ttl, now, value)
+    return value
+
+
+def _get_info(ticker: str) -> Dict[str, Any]:
+    """Get the (cached) info dictionary for a ticker.
+
+    Raises:
+        UnknownTickerError: If Yahoo Finance returned no data for the ticker,
+            now or within the last NEGATIVE_TTL seconds.
+    """
+    # Yahoo symbols are case-insensitive; key every cache on the upper-cased form
+    ticker = ticker.upper()
+    failed = _NEGATIVE_CACHE.get(ticker)
+    if failed is not None:
+        if time.monotonic() - failed[0] < NEGATIVE_TTL:
+            raise UnknownTickerError(f"Unknown ticker: {ticker}")
+        _NEGATIVE_CACHE.pop(ticker, None)
+    
+    info: Dict[str, Any] = _cached(_INFO_CACHE, ticker, INFO_TTL, lambda: _get_ticker(ticker).info)
+    if not info or not any(info.get(field) for field in _IDENTITY_FIELDS):
+        _INFO_CACHE.pop(ticker, None)
+        _store(_NEGATIVE_CACHE, ticker, NEGATIVE_TTL, time.monotonic(), None)
+        raise UnknownTickerError(f"Unknown ticker: {ticker}")
+    return info
+
+
+def _get_history(ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+    """Get the (cached) price history for a ticker."""
+    ticker = ticker.upper()
+    return _cached(
+        _HISTORY_CACHE, (ticker, period, interval), HISTORY_TTL,
+        lambda: _get_ticker(ticker).history(period=period, interval=interval, timeout=HTTP_TIMEOUT),
+    )
+
+
+def _get_histories(tickers: List[str], period: str = "1y") -> Dict[str, pd.DataFrame]:
+    """Get (cached) daily price histories for several tickers.
+
+    Tickers without a fresh cache entry are fetched together in a single
+    batched ``yf.download`` request instead of one round-trip per ticker.
+    """
+    now = time.monotonic()
+    # yf.download upper-cases symbols, so look them up (and key the cache) the same way
+    symbols = {ticker: ticker.upper() for ticker in tickers}
+    fresh: Dict[str, pd.DataFrame] = {}
+    missing = []
+    for symbol in dict.fromkeys(symbols.values()):
+        entry = _DOWNLOAD_CACHE.get((symbol, period))
+        if entry is None or now - entry[0] >= HISTORY_TTL:
+            missing.append(symbol)
+        else:
+            fresh[symbol] = entry[1]
+    
+    if missing:
+        data = yf.download(
+            missing, period=period, group_by="ticker", threads=True, progress=False,
+            session=_YF_SESSION, timeout=HTTP_TIMEOUT,
+        )
+        downloaded = set(data.columns.get_level_values(0)) if data is not None else set()
+        for symbol in missing:
+            history = data[symbol].dropna(how="all") if symbol in downloaded else pd.DataFrame()
+            _store(_DOWNLOAD_CACHE, (symbol, period), HISTORY_TTL, now, history)
+            fresh[symbol] = history
+    
+    return {ticker: fresh[symbol] for ticker, symbol in symbols.items()}
+
 
+def _get_dividends(ticker: str) -> pd.Series:
+    """Get the (cached) dividend history for a ticker."""
+    ticker = ticker.upper()
+    return _cached(_DIVIDENDS_CACHE, ticker, DIVIDENDS_TTL, lambda: _get_ticker(ticker).dividends)
+
+
+def _round(value: Any, digits: int = 4) -> Any:
+    """Round numeric values, passing through placeholders such as "N/A"."""
+    return round(value, digits) if isinstance(value, (int, float)) else value
+
+
+def _price(info: Dict[str, Any]) -> Any:
+    """Get the current price from a ticker info dictionary."""
+    return info.get("currentPrice") or info.get("regularMarketPrice") or "N/A"
+
+
+def _project_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the reported fields out of a ticker info dictionary."""
+    result = {key: info.get(source, "N/A") for key, source in _INFO_FIELDS}
+    result["current_price"] = _price(info)
+    result["pe_ratio"] = _round(result["pe_ratio"])
+    result["dividend_yield"] = _round(result["dividend_yield"])
+    return result
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool response to an indented JSON string.
+
+    NumPy scalars and arrays are serialized natively, and NaN becomes null.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+async def _run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking function in the yfinance thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_YF_POOL, partial(func, *args))
+
+
+def clear_caches() -> None:
+    """Drop all cached Yahoo Finance results."""
+    _INFO_CACHE.clear()
+    _HISTORY_CACHE.clear()
+    _DOWNLOAD_CACHE.clear()
+    _DIVIDENDS_CACHE.clear()
+    _NEGATIVE_CACHE.clear()
 
 
 @mcp.tool()
@@ -51,25 +262,13 @@ async def get_stock_info(ticker: str) -> str:
         yfinance
     """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = await _run_blocking(_get_info, ticker)
         
         # Extract key information
-        result = {
-            "ticker": ticker,
-            "name": info.get("shortName", "N/A"),
-            "sector": info.get("sector", "N/A"),
-            "industry": info.get("industry", "N/A"),
-            "market_cap": info.get("marketCap", "N/A"),
-            "current_price": info.get("currentPrice", info.get("regularMarketPrice", "N/A")),
-            "pe_ratio": info.get("trailingPE", "N/A"),
-            "dividend_yield": info.get("dividendYield", "N/A"),
-            "52_week_high": info.get("fiftyTwoWeekHigh", "N/A"),
-            "52_week_low": info.get("fiftyTwoWeekLow", "N/A")
-        }
-        return json.dumps(result, indent=2)
+        result = {"ticker": ticker, **_project_info(info)}
+        return _dumps(result)
     except Exception as e:
-        return json.dumps({"error": f"Error retrieving stock info for {ticker}: {str(e)}"})
+        return _dumps({"error": f"Error retrieving stock info for {ticker}: {str(e)}"})
 
 
 @mcp.tool()
@@ -80,47 +279,60 @@ async def get_historical_data(ticker: str, period: str = "1y", interval: str = "
         yfinance
     """
     try:
-        stock = yf.Ticker(ticker)
-        history = stock.history(period=period, interval=interval)
+        history = await _run_blocking(_get_history, ticker, period, interval)
         
         if history.empty:
-            return json.dumps({"error": f"No historical data available for {ticker}"})
+            return _dumps({"error": f"No historical data available for {ticker}"})
             
+        # Pull the columns out once and reduce over the raw arrays
+        close = history["Close"].to_numpy()
+        high = history["High"].to_numpy()
+        low = history["Low"].to_numpy()
+        volume = history["Volume"].to_numpy()
+        start_price = close[0]
+        end_price = close[-1]
+        
         # Calculate basic statistics
         stats = {
             "start_date": history.index[0].strftime("%Y-%m-%d"),
             "end_date": history.index[-1].strftime("%Y-%m-%d"),
-            "start_price": round(history["Close"].iloc[0], 2),
-            "end_price": round(history["Close"].iloc[-1], 2),
-            "min_price": round(history["Low"].min(), 2),
-            "max_price": round(history["High"].max(), 2),
-            "price_change": round(history["Close"].iloc[-1] - history["Close"].iloc[0], 2),
-            "price_change_pct": round(((history["Close"].iloc[-1] / history["Close"].iloc[0]) - 1) * 100, 2),
-            "avg_volume": round(history["Volume"].mean(), 2)
+            "start_price": round(start_price, 2),
+            "end_price": round(end_price, 2),
+            "min_price": round(np.nanmin(low), 2),
+            "max_price": round(np.nanmax(high), 2),
+            "price_change": round(end_price - start_price, 2),
+            "price_change_pct": round(((end_price / start_price) - 1) * 100, 2),
+            "avg_volume": round(np.nanmean(volume), 2)
         }
         
-        # Sample data points (limit to 30 points to avoid overwhelming response)
+        # Sample evenly spaced data points (limit to 30 points to avoid overwhelming response)
         max_points = 30
-        if len(history) > max_points:
-            step = len(history) // max_points
-            sample_data = history.iloc[::step].tail(max_points)
-        else:
-            sample_data = history
-            
-        sample_data_dict = sample_data[["Open", "High", "Low", "Close", "Volume"]].reset_index()
-        sample_data_dict["Date"] = sample_data_dict["Date"].astype(str)
+        sample_idx = np.linspace(0, len(close) - 1, min(max_points, len(close)), dtype=np.int64)
+        
+        # Build the records straight from the sampled rows of each array
+        sample_data = [
+            {"Date": date, "Open": o, "High": h, "Low": lo, "Close": c, "Volume": v}
+            for date, o, h, lo, c, v in zip(
+                history.index[sample_idx].astype(str),
+                history["Open"].to_numpy()[sample_idx].tolist(),
+                high[sample_idx].tolist(),
+                low[sample_idx].tolist(),
+                close[sample_idx].tolist(),
+                volume[sample_idx].tolist(),
+            )
+        ]
         
         result = {
             "ticker": ticker,
             "period": period,
             "interval": interval,
             "stats": stats,
-            "sample_data": sample_data_dict.to_dict("records")
+            "sample_data": sample_data
         }
         
-        return json.dumps(result, indent=2)
+        return _dumps(result)
     except Exception as e:
-        return json.dumps({"error": f"Error retrieving historical data for {ticker}: {str(e)}"})
+        return _dumps({"error": f"Error retrieving historical data for {ticker}: {str(e)}"})
 
 
 @mcp.tool()
@@ -131,11 +343,10 @@ async def get_dividends(ticker: str) -> str:
         yfinance
     """
     try:
-        stock = yf.Ticker(ticker)
-        dividends = stock.dividends
+        dividends = await _run_blocking(_get_dividends, ticker)
         
         if dividends is None or dividends.empty:
-            return json.dumps({
+            return _dumps({
                 "ticker": ticker,
                 "has_dividends": False,
                 "message": "This stock does not pay dividends."
@@ -146,28 +357,28 @@ async def get_dividends(ticker: str) -> str:
         ttm_dividend = last_year_divs.sum()
         
         # Get current price for yield calculation
-        current_price = stock.info.get("currentPrice", stock.info.get("regularMarketPrice", 0))
+        info = await _run_blocking(_get_info, ticker)
+        current_price = info.get("currentPrice", info.get("regularMarketPrice", 0))
         
         # Calculate current yield
         current_yield = (ttm_dividend / current_price) * 100 if current_price > 0 else 0
         
-        # Format dividend history
-        div_items = [(idx.strftime("%Y-%m-%d"), float(val)) for idx, val in dividends.items()]
-        div_items.sort(key=lambda x: x[0], reverse=True)
-        recent_dividends = div_items[:8]
+        # Format the 8 most recent dividends, newest first (the series is date-ordered)
+        recent = dividends.tail(8).iloc[::-1]
+        recent_dividends = [{"date": idx.strftime("%Y-%m-%d"), "amount": val} for idx, val in recent.items()]
         
         result = {
             "ticker": ticker,
             "has_dividends": True,
             "dividend_yield_percent": round(current_yield, 2),
-            "ttm_dividend": float(ttm_dividend),
+            "ttm_dividend": ttm_dividend,
             "current_price": current_price,
-            "dividend_history": [{"date": date, "amount": amount} for date, amount in recent_dividends]
+            "dividend_history": recent_dividends
         }
         
-        return json.dumps(result, indent=2)
+        return _dumps(result)
     except Exception as e:
-        return json.dumps({"error": f"Error retrieving dividend information for {ticker}: {str(e)}"})
+        return _dumps({"error": f"Error retrieving dividend information for {ticker}: {str(e)}"})
 
 
 @mcp.tool()
@@ -179,18 +390,30 @@ async def compare_stocks(tickers: List[str], period: str = "1y") -> str:
     """
     try:
         if not isinstance(tickers, list):
-            return json.dumps({"error": "Tickers must be provided as a list."})
+            return _dumps({"error": "Tickers must be provided as a list."})
             
         # Limit the number of tickers to compare
         max_tickers = 5
         if len(tickers) > max_tickers:
             tickers = tickers[:max_tickers]
             
+        # Fetch the batched histories and every ticker's info concurrently
+        histories, *infos = await asyncio.gather(
+            _run_blocking(_get_histories, tickers, period),
+            *(_run_blocking(_get_info, ticker) for ticker in tickers),
+            return_exceptions=True,
+        )
+        if isinstance(histories, BaseException):
+            raise histories
+        
         stock_data = {}
-        for ticker in tickers:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            history = stock.history(period=period)
+        for ticker, info in zip(tickers, infos):
+            # Unknown tickers are reported as N/A rather than failing the comparison
+            if isinstance(info, UnknownTickerError):
+                info = {}
+            elif isinstance(info, BaseException):
+                raise info
+            history = histories[ticker]
             
             if not history.empty:
                 start_price = history["Close"].iloc[0]
@@ -201,14 +424,7 @@ async def compare_stocks(tickers: List[str], period: str = "1y") -> str:
                 start_price = end_price = price_change = price_change_pct = "N/A"
                 
             stock_data[ticker] = {
-                "name": info.get("shortName", "N/A"),
-                "sector": info.get("sector", "N/A"),
-                "market_cap": info.get("marketCap", "N/A"),
-                "current_price": info.get("currentPrice", info.get("regularMarketPrice", "N/A")),
-                "pe_ratio": info.get("trailingPE", "N/A"),
-                "dividend_yield": info.get("dividendYield", "N/A"),
-                "52_week_high": info.get("fiftyTwoWeekHigh", "N/A"),
-                "52_week_low": info.get("fiftyTwoWeekLow", "N/A"),
+                **_project_info(info),
                 "start_price": start_price,
                 "end_price": end_price,
                 "price_change": price_change,
@@ -221,9 +437,66 @@ async def compare_stocks(tickers: List[str], period: str = "1y") -> str:
             "comparison": stock_data
         }
         
-        return json.dumps(result, indent=2)
+        return _dumps(result)
     except Exception as e:
-        return json.dumps({"error": f"Error comparing stocks: {str(e)}"})
+        return _dumps({"error": f"Error comparing stocks: {str(e)}"})
+
+
+def _pearson(a: np.ndarray, b: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """Fused Pearson correlation kernel (compiled by _get_pearson_kernel).
+
+    Returns (r, mean_a, std_a, mean_b, std_b) using population standard
+    deviations, matching np.corrcoef/np.std. Means are taken in a first
+    pass and centered sums in a second, which avoids the cancellation of
+    the one-pass sum-of-squares formula on large-valued price series.
+    """
+    n = a.shape[0]
+    sa = 0.0
+    sb = 0.0
+    for i in range(n):
+        sa += a[i]
+        sb += b[i]
+    mean_a = sa / n
+    mean_b = sb / n
+
+    saa = 0.0
+    sbb = 0.0
+    sab = 0.0
+    for i in range(n):
+        da = a[i] - mean_a
+        db = b[i] - mean_b
+        saa += da * da
+        sbb += db * db
+        sab += da * db
+
+    denom = np.sqrt(saa * sbb)
+    r = sab / denom if denom > 0.0 else np.nan
+    return r, mean_a, np.sqrt(saa / n), mean_b, np.sqrt(sbb / n)
+
+
+@lru_cache(maxsize=None)
+def _get_pearson_kernel() -> Callable[[np.ndarray, np.ndarray], Tuple[float, ...]]:
+    """Import Numba and compile (or load from its disk cache) the correlation kernel.
+
+    Deferred to the first large-series call so server start-up doesn't pay
+    for importing Numba/LLVM. Numba writes its cache to __pycache__ beside
+    this module; when that is read-only, set NUMBA_CACHE_DIR to a writable
+    directory or the kernel is recompiled in every new process.
+    """
+    from numba import njit, types
+    
+    # The kernel only reads its inputs, so type them as read-only arrays: that
+    # signature also accepts writable ones, and read-only arrays such as
+    # pandas' Series.to_numpy() would otherwise have no matching definition
+    series = types.Array(types.float64, 1, "A", readonly=True)
+    return njit(
+        types.UniTuple(types.float64, 5)(series, series), cache=True, fastmath={"reassoc", "contract"},
+    )(_pearson)
+
+
+def _pearson_jit(a: np.ndarray, b: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """Run the compiled correlation kernel, compiling it first if needed."""
+    return _get_pearson_kernel()(a, b)
 
 
 @mcp.tool()
@@ -231,46 +504,59 @@ async def calculate_correlation(series1: List[float], series2: List[float]) -> s
     """Calculate correlation between two time series.
 
     Args:
-        series1: First time series as a list of float values
-        series2: Second time series as a list of float values
+        series1: First time series as a list (or NumPy array) of float values
+        series2: Second time series as a list (or NumPy array) of float values
 
     Returns:
         JSON string containing correlation coefficient and analysis
     """
     try:
-        if not isinstance(series1, list) or not isinstance(series2, list):
-            return json.dumps({"error": "Both inputs must be lists of numbers"})
+        if not isinstance(series1, (list, np.ndarray)) or not isinstance(series2, (list, np.ndarray)):
+            return _dumps({"error": "Both inputs must be lists of numbers"})
             
-        if len(series1) != len(series2):
-            return json.dumps({"error": "Both series must have the same length"})
+        # Convert to float64 arrays (no copy if the input already is one)
+        arr1 = np.asarray(series1, dtype=np.float64)
+        arr2 = np.asarray(series2, dtype=np.float64)
+        if arr1.ndim != 1 or arr2.ndim != 1:
+            return _dumps({"error": "Both inputs must be lists of numbers"})
             
-        if len(series1) < 2:
-            return json.dumps({"error": "Need at least 2 data points to calculate correlation"})
+        n = arr1.shape[0]
+        if n != arr2.shape[0]:
+            return _dumps({"error": "Both series must have the same length"})
             
-        # Convert to numpy arrays for calculation
-        arr1 = np.array(series1)
-        arr2 = np.array(series2)
+        if n < 2:
+            return _dumps({"error": "Need at least 2 data points to calculate correlation"})
         
-        # Calculate correlation coefficient
-        correlation = np.corrcoef(arr1, arr2)[0, 1]
+        # Calculate correlation coefficient and per-series statistics
+        if n < CORRELATION_JIT_THRESHOLD:
+            correlation = float(np.corrcoef(arr1, arr2)[0, 1])
+            mean1, std1 = float(arr1.mean()), float(arr1.std())
+            mean2, std2 = float(arr2.mean()), float(arr2.std())
+        else:
+            # The first call imports Numba and compiles; keep that (and the loop) off the event loop
+            correlation, mean1, std1, mean2, std2 = await _run_blocking(_pearson_jit, arr1, arr2)
         
         # Calculate additional statistics
         result = {
             "correlation": round(correlation, 4),
-            "series_length": len(series1),
+            "series_length": n,
             "series1_stats": {
-                "mean": round(float(np.mean(arr1)), 4),
-                "std": round(float(np.std(arr1)), 4)
+                "mean": round(mean1, 4),
+                "std": round(std1, 4)
             },
             "series2_stats": {
-                "mean": round(float(np.mean(arr2)), 4),
-                "std": round(float(np.std(arr2)), 4)
+                "mean": round(mean2, 4),
+                "std": round(std2, 4)
             }
         }
         
-        return json.dumps(result, indent=2)
+        return _dumps(result)
     except Exception as e:
-        return json.dumps({"error": f"Error calculating correlation: {str(e)}"})
+        return _dumps({"error": f"Error calculating correlation: {str(e)}"})
+
+
+# Read-only name -> tool table, frozen once every tool above is registered
+TOOL_REGISTRY = MappingProxyType(dict(mcp._tool_manager._tools))
 
 
 def create_starlette_app(mcp_server: Server, *, debug: bool = False) -> Starlette:
@@ -286,11 +572,9 @@ def create_starlette_app(mcp_server: Server, *, debug: bool = False) -> Starlett
                     read_stream, write_stream, mcp_server.create_initialization_options(),
                 )
             # Return a proper response after successful SSE connection
-            from starlette.responses import Response
             return Response(status_code=200)
         except Exception as e:
             # Return a proper error response instead of letting it bubble up
-            from starlette.responses import JSONResponse
             return JSONResponse(
                 status_code=500,
                 content={"error": f"SSE connection failed: {str(e)}"}
@@ -325,14 +609,15 @@ def main():
     # Add health check endpoint
     @starlette_app.route("/health")
     async def health_check(request):
-        from starlette.responses import JSONResponse
         return JSONResponse({"status": "healthy", "service": "mcp-server"})
     
     # Run the server
     logger.info(f"Starting MCP server on {args.host}:{args.port}")
-    logger.info(f"Available tools: {list(mcp._tool_manager._tools.keys())}")
+    logger.info(f"Available tools: {list(TOOL_REGISTRY)}")
     
-    uvicorn.run(starlette_app, host=args.host, port=args.port)
+    # Use the libuv event loop and C HTTP parser (uvloop has no Windows build)
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    uvicorn.run(starlette_app, host=args.host, port=args.port, loop=loop, http="httptools")
 
 
 if __name__ == "__main__":
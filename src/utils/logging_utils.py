@@ -4,11 +4,35 @@ Logging utilities for MCP tools.
 This module provides logging setup and configuration for MCP tools.
 """
 
+import functools
 import logging
-import json
 import sys
-from typing import Dict, Any, Optional
-from datetime import datetime, UTC
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, Any, Callable, Optional, TextIO, Tuple, TypeVar, cast
+
+# Log level names accepted by setup_logging
+_LEVELS = {
+    "NOTSET": logging.NOTSET,
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARN": logging.WARN,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "FATAL": logging.FATAL,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# The shared tool logger, bound once instead of looked up per call
+_LOGGER = logging.getLogger("mcp_tool")
+
+# Type of the functions wrapped by log_execution_time
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Arguments of the last setup_logging call that configured the logger
+_active_config: Optional[tuple] = None
 
 
 def setup_logging(
@@ -29,11 +53,21 @@ def setup_logging(
     Returns:
         Configured logger instance
     """
+    global _active_config
+    
     # Create logger
-    logger = logging.getLogger("mcp_tool")
-    logger.setLevel(getattr(logging, level.upper()))
+    logger = _LOGGER
+    
+    # Reuse the existing handlers if nothing has changed
+    config = (level.upper(), format_type.lower(), output.lower(), log_file)
+    if config == _active_config and logger.handlers:
+        return logger
     
-    # Clear existing handlers
+    logger.setLevel(_LEVELS[config[0]])
+    
+    # Close and clear existing handlers (stopping any background writers)
+    for handler in logger.handlers:
+        handler.close()
     logger.handlers.clear()
     
     # Create formatter
@@ -46,19 +80,20 @@ def setup_logging(
     
     # Create console handler
     if output.lower() == "stderr":
-        console_handler = logging.StreamHandler(sys.stderr)
+        console_handler = BufferedAsyncHandler(sys.stderr)
     else:
-        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler = BufferedAsyncHandler(sys.stdout)
     
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
     
     # Create file handler if specified
     if log_file:
-        file_handler = logging.FileHandler(log_file)
+        file_handler = BufferedFileHandler(log_file)
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
     
+    _active_config = config
     return logger
 
 
@@ -70,27 +105,190 @@ class JsonFormatter(logging.Formatter):
     integration with log aggregation systems.
     """
     
+    # (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") of the last record seen
+    _second_cache: Tuple[Optional[int], str] = (None, "")
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the formatter and its cache of pre-serialized call-site fields."""
+        super().__init__(*args, **kwargs)
+        # Imported here so text-format logging never pays for loading orjson
+        import orjson
+        self._dumps = orjson.dumps
+        # (level, logger, module, function, line) -> JSON text around the message;
+        # bounded by the number of logging call sites
+        self._templates: Dict[tuple, Tuple[str, str]] = {}
+    
+    def _timestamp(self, created: float) -> str:
+        """Format a record's creation time as ISO 8601 UTC with microseconds."""
+        seconds = int(created)
+        cached_second, prefix = self._second_cache
+        if seconds != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+            self._second_cache = (seconds, prefix)
+        return f"{prefix}.{int((created - seconds) * 1_000_000):06d}+00:00"
+    
+    def _template(self, key: tuple) -> Tuple[str, str]:
+        """Serialize the fixed fields of a call site into the JSON before and after the message."""
+        level, name, module, function, line = (self._dumps(value).decode() for value in key)
+        template = self._templates[key] = (
+            f'","level":{level},"logger":{name},"message":',
+            f',"module":{module},"function":{function},"line":{line}}}'
+        )
+        return template
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
+        # Read the fixed fields straight from the instance dict in one go
+        d = record.__dict__
+        exc_info = d["exc_info"]
+        extra_fields = d.get("extra_fields")
+        
+        # Common case: splice the timestamp and escaped message into the call site's template
+        if not exc_info and extra_fields is None:
+            key = (d["levelname"], d["name"], d["module"], d["funcName"], d["lineno"])
+            head, tail = self._templates.get(key) or self._template(key)
+            message = self._dumps(record.getMessage()).decode()
+            return f'{{"timestamp":"{self._timestamp(d["created"])}{head}{message}{tail}'
+        
         log_entry = {
-            "timestamp": datetime.now(UTC).isoformat(),
-            "level": record.levelname,
-            "logger": record.name,
+            "timestamp": self._timestamp(d["created"]),
+            "level": d["levelname"],
+            "logger": d["name"],
             "message": record.getMessage(),
-            "module": record.module,
-            "function": record.funcName,
-            "line": record.lineno
+            "module": d["module"],
+            "function": d["funcName"],
+            "line": d["lineno"]
         }
         
         # Add exception info if present
-        if record.exc_info:
-            log_entry["exception"] = self.formatException(record.exc_info)
+        if exc_info:
+            log_entry["exception"] = self.formatException(exc_info)
+        
+        # Add extra fields if present (a dict lookup rather than hasattr's getattr/except)
+        if extra_fields is not None:
+            log_entry.update(extra_fields)
         
-        # Add extra fields if present
-        if hasattr(record, 'extra_fields'):
-            log_entry.update(record.extra_fields)
+        # Values orjson can't serialize natively (e.g. Decimal) fall back to str()
+        return self._dumps(log_entry, default=str).decode()
+
+
+class BufferedAsyncHandler(logging.Handler):
+    """
+    Stream handler that hands records to a background writer thread.
+    
+    Records are formatted on the logging thread and appended to a deque,
+    which is thread-safe without taking the handler lock, so concurrent
+    tool calls never contend on logging. A daemon thread drains the
+    buffer in batches and writes each batch to the stream in one call.
+    Records at or above flush_level are written immediately, and any
+    remainder is flushed by logging.shutdown at interpreter exit.
+    """
+    
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        flush_interval: float = 0.05,
+        flush_level: int = logging.ERROR
+    ) -> None:
+        """
+        Initialize the handler and start its writer thread.
+        
+        Args:
+            stream: Output stream (defaults to sys.stdout)
+            flush_interval: Seconds between background flushes
+            flush_level: Records at or above this level flush the buffer at once
+        """
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._buffer: deque = deque()
+        # Serializes writers; deliberately not self.lock, which logging.shutdown
+        # holds while calling close() (and so while close() joins the writer)
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._writer = threading.Thread(
+            target=self._run, name="mcp-log-writer", daemon=True
+        )
+        self._writer.start()
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Filter and emit a record without acquiring the handler lock."""
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Format the record and queue it for the writer thread."""
+        try:
+            self._buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        
+        # Don't leave errors sitting in the buffer if the process is about to die
+        if record.levelno >= self.flush_level:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write all buffered records to the stream."""
+        # Only writers take the lock, so batches are never interleaved
+        with self._write_lock:
+            batch = []
+            try:
+                while True:
+                    batch.append(self._buffer.popleft())
+            except IndexError:
+                pass
+            if not batch:
+                return
+            try:
+                self.stream.write("\n".join(batch) + "\n")
+                self.stream.flush()
+            except Exception:
+                if logging.raiseExceptions:
+                    traceback.print_exc(file=sys.stderr)
+    
+    def close(self) -> None:
+        """Stop the writer thread and flush any remaining records."""
+        self._closed.set()
+        if self._writer is not threading.current_thread():
+            self._writer.join()
+        self.flush()
+        super().close()
+    
+    def _run(self) -> None:
+        """Periodically drain the buffer until the handler is closed."""
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+
+class BufferedFileHandler(BufferedAsyncHandler):
+    """
+    File handler that batches records through a 64KB buffered stream.
+    
+    The file is opened once and never stat'ed per record, so rotation is
+    left to an external tool such as logrotate with copytruncate.
+    """
+    
+    def __init__(self, filename: str, flush_interval: float = 0.05, flush_level: int = logging.ERROR) -> None:
+        """
+        Open the log file for appending and start the writer thread.
         
-        return json.dumps(log_entry)
+        Args:
+            filename: Path of the log file
+            flush_interval: Seconds between background flushes
+            flush_level: Records at or above this level flush the buffer at once
+        """
+        self.baseFilename = filename
+        stream = open(filename, "a", buffering=65536, encoding="utf-8")
+        super().__init__(stream, flush_interval, flush_level)
+    
+    def close(self) -> None:
+        """Flush remaining records and close the file."""
+        super().close()
+        self.stream.close()
 
 
 def get_logger(name: str = "mcp_tool") -> logging.Logger:
@@ -106,54 +304,94 @@ def get_logger(name: str = "mcp_tool") -> logging.Logger:
     return logging.getLogger(name)
 
 
-def log_execution_time(func):
+def _log_execution(logger: logging.Logger, func_name: str, start_time: float, error: Optional[Exception] = None) -> None:
+    """
+    Log the outcome and duration of a call timed by log_execution_time.
+    
+    Args:
+        logger: Logger to emit to
+        func_name: Name of the timed function
+        start_time: time.perf_counter() value taken before the call
+        error: Exception raised by the call, if any
+    """
+    if error is not None:
+        logger.error(
+            f"Function {func_name} failed: {str(error)}",
+            extra={
+                "function": func_name,
+                "execution_time": time.perf_counter() - start_time,
+                "status": "error",
+                "error": str(error)
+            }
+        )
+    elif logger.isEnabledFor(logging.INFO):
+        logger.info(
+            f"Function {func_name} executed successfully",
+            extra={
+                "function": func_name,
+                "execution_time": time.perf_counter() - start_time,
+                "status": "success"
+            }
+        )
+
+
+def log_execution_time(func: F) -> F:
     """
     Decorator to log function execution time.
     
+    Coroutine functions are wrapped so that the awaited execution is timed,
+    not just the creation of the coroutine object.
+    
     Args:
         func: Function to decorate
         
     Returns:
         Decorated function
     """
-    def wrapper(*args, **kwargs):
-        logger = get_logger()
-        start_time = datetime.now(UTC)
-        
-        try:
-            result = func(*args, **kwargs)
-            execution_time = (datetime.now(UTC) - start_time).total_seconds()
+    # Only needed at decoration time, so kept off the module's import path
+    import inspect
+    
+    logger = _LOGGER
+    
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            # Skip timing entirely when neither the success nor failure log would be emitted
+            if not logger.isEnabledFor(logging.ERROR):
+                return await func(*args, **kwargs)
             
-            logger.info(
-                f"Function {func.__name__} executed successfully",
-                extra={
-                    "function": func.__name__,
-                    "execution_time": execution_time,
-                    "status": "success"
-                }
-            )
+            start_time = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                _log_execution(logger, func.__name__, start_time, e)
+                raise
             
+            _log_execution(logger, func.__name__, start_time)
             return result
-            
+        
+        return cast(F, async_wrapper)
+    
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Skip timing entirely when neither the success nor failure log would be emitted
+        if not logger.isEnabledFor(logging.ERROR):
+            return func(*args, **kwargs)
+        
+        start_time = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
         except Exception as e:
-            execution_time = (datetime.now(UTC) - start_time).total_seconds()
-            
-            logger.error(
-                f"Function {func.__name__} failed: {str(e)}",
-                extra={
-                    "function": func.__name__,
-                    "execution_time": execution_time,
-                    "status": "error",
-                    "error": str(e)
-                }
-            )
-            
+            _log_execution(logger, func.__name__, start_time, e)
             raise
+        
+        _log_execution(logger, func.__name__, start_time)
+        return result
     
-    return wrapper
+    return cast(F, wrapper)
 
 
-def log_tool_execution(tool_name: str, input_data: Dict[str, Any], output_data: Dict[str, Any], execution_time: float):
+def log_tool_execution(tool_name: str, input_data: Dict[str, Any], output_data: Dict[str, Any], execution_time: float) -> None:
     """
     Log tool execution details.
     
@@ -163,15 +401,20 @@ def log_tool_execution(tool_name: str, input_data: Dict[str, Any], output_data:
         output_data: Tool output data
         execution_time: Execution time in seconds
     """
-    logger = get_logger()
+    # Don't build the extra payload (which may hold large tool outputs) unless it will be logged;
+    # the data is passed through as-is via extra_fields, which JsonFormatter serializes
+    if not _LOGGER.isEnabledFor(logging.INFO):
+        return
     
-    logger.info(
+    _LOGGER.info(
         f"Tool {tool_name} executed",
         extra={
-            "tool_name": tool_name,
-            "input_data": input_data,
-            "output_data": output_data,
-            "execution_time": execution_time,
-            "status": "success"
+            "extra_fields": {
+                "tool_name": tool_name,
+                "input_data": input_data,
+                "output_data": output_data,
+                "execution_time": execution_time,
+                "status": "success"
+            }
         }
-    ) 
\ No newline at end of file
+    )
@@ -0,0 +1,14 @@
+"""
+Shared pytest configuration for the test suite.
+"""
+
+import asyncio
+import sys
+
+
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests on uvloop, as the server does, where it is available."""
+    if sys.platform == "win32":
+        return {"asyncio": asyncio.new_event_loop}
+    import uvloop
+    return {"uvloop": uvloop.new_event_loop}
@@ -0,0 +1,242 @@
+"""
+Tests for the logging utilities.
+
+This module contains tests for the JSON formatter and log handlers.
+"""
+
+import asyncio
+from decimal import Decimal
+import io
+import json
+import logging
+import sys
+import threading
+import time
+import pytest
+
+from utils.logging_utils import BufferedAsyncHandler, BufferedFileHandler, JsonFormatter, log_execution_time, log_tool_execution, setup_logging
+
+
+def make_record(message: str = "hello", level: int = logging.INFO) -> logging.LogRecord:
+    """Build a log record as a logger call site would."""
+    return logging.LogRecord("mcp_tool", level, __file__, 42, message, None, None, func="caller")
+
+
+@pytest.fixture
+def caplog_only(caplog, monkeypatch):
+    """Capture mcp_tool records with caplog alone, detaching the real console handlers."""
+    monkeypatch.setattr(logging.getLogger("mcp_tool"), "handlers", [])
+    return caplog
+
+
+class TestLoggingUtils:
+    """Test cases for the logging utilities."""
+
+    def test_json_formatter(self):
+        """Test that JsonFormatter emits one JSON object per record."""
+        entry = json.loads(JsonFormatter().format(make_record("hello")))
+
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "mcp_tool"
+        assert entry["message"] == "hello"
+        assert entry["function"] == "caller"
+        assert entry["line"] == 42
+        assert entry["timestamp"].endswith("+00:00")
+
+    def test_json_formatter_template_matches_dict_path(self):
+        """Test that the template output equals the dict serialization, including escaping."""
+        formatter = JsonFormatter()
+        record = make_record('say "hi"\n\u00e9')
+        plain = formatter.format(record)
+        record.extra_fields = {}
+        via_dict = formatter.format(record)
+
+        assert plain == via_dict
+        assert json.loads(plain)["message"] == 'say "hi"\n\u00e9'
+
+    def test_json_formatter_exception_and_extra_fields(self):
+        """Test that exception text and extra_fields are merged into the entry."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("mcp_tool", logging.ERROR, __file__, 42, "failed", None, sys.exc_info())
+        record.extra_fields = {"ticker": "AAPL"}
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert "ValueError: boom" in entry["exception"]
+        assert entry["ticker"] == "AAPL"
+
+    def test_buffered_handler_writes_on_flush(self):
+        """Test that buffered records are written in order on flush."""
+        stream = io.StringIO()
+        handler = BufferedAsyncHandler(stream, flush_interval=60)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        try:
+            for i in range(3):
+                handler.handle(make_record(f"message {i}"))
+            handler.flush()
+
+            assert stream.getvalue() == "message 0\nmessage 1\nmessage 2\n"
+        finally:
+            handler.close()
+
+    def test_buffered_handler_flushes_on_close(self):
+        """Test that closing the handler writes any pending records."""
+        stream = io.StringIO()
+        handler = BufferedAsyncHandler(stream, flush_interval=60)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.handle(make_record("pending"))
+        handler.close()
+
+        assert stream.getvalue() == "pending\n"
+
+    def test_buffered_handler_close_under_handler_lock(self):
+        """Test that close() completes while the handler lock is held, as in logging.shutdown."""
+        class SlowStream(io.StringIO):
+            def write(self, text):
+                time.sleep(0.06)
+                return super().write(text)
+
+        stream = SlowStream()
+        handler = BufferedAsyncHandler(stream, flush_interval=0.01)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.handle(make_record("pending"))
+
+        def shutdown():
+            with handler.lock:
+                time.sleep(0.05)
+                handler.flush()
+                handler.close()
+
+        closer = threading.Thread(target=shutdown, daemon=True)
+        closer.start()
+        closer.join(timeout=5)
+
+        assert not closer.is_alive()
+        assert stream.getvalue() == "pending\n"
+
+    def test_buffered_handler_flushes_on_error(self):
+        """Test that an ERROR record writes the buffer without waiting for the timer."""
+        stream = io.StringIO()
+        handler = BufferedAsyncHandler(stream, flush_interval=60)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        try:
+            handler.handle(make_record("queued"))
+            assert stream.getvalue() == ""
+
+            handler.handle(make_record("failed", logging.ERROR))
+            assert stream.getvalue() == "queued\nfailed\n"
+        finally:
+            handler.close()
+
+    def test_buffered_file_handler(self, tmp_path):
+        """Test that the file handler appends batched records and closes the file."""
+        log_file = tmp_path / "mcp.log"
+        log_file.write_text("existing\n")
+        handler = BufferedFileHandler(str(log_file), flush_interval=60)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.handle(make_record("appended"))
+        handler.close()
+
+        assert log_file.read_text() == "existing\nappended\n"
+        assert handler.stream.closed
+
+    def test_setup_logging_reuses_handlers(self):
+        """Test that repeated setup_logging calls with the same arguments keep the handlers."""
+        logger = setup_logging(level="info")
+        handlers = list(logger.handlers)
+
+        assert setup_logging(level="INFO").handlers == handlers
+        assert logger.level == logging.INFO
+
+        reconfigured = setup_logging(level="DEBUG")
+        assert reconfigured.handlers != handlers
+        assert reconfigured.level == logging.DEBUG
+
+        setup_logging()
+
+    @pytest.mark.parametrize("name, level", [
+        ("warn", logging.WARNING),
+        ("FATAL", logging.CRITICAL),
+        ("NOTSET", logging.NOTSET),
+    ])
+    def test_setup_logging_level_aliases(self, name, level):
+        """Test that the stdlib level aliases are accepted."""
+        try:
+            assert setup_logging(level=name).level == level
+        finally:
+            setup_logging()
+
+    def test_log_execution_time(self, caplog_only):
+        """Test that log_execution_time records success and failure timings."""
+        @log_execution_time
+        def add(a, b):
+            return a + b
+
+        @log_execution_time
+        def fail():
+            raise ValueError("boom")
+
+        with caplog_only.at_level(logging.INFO, logger="mcp_tool"):
+            assert add(1, 2) == 3
+            with pytest.raises(ValueError):
+                fail()
+
+        success, failure = caplog_only.records
+        assert success.status == "success"
+        assert success.execution_time >= 0
+        assert failure.status == "error"
+        assert failure.error == "boom"
+
+    def test_log_execution_time_disabled(self, caplog_only):
+        """Test that nothing is logged when the logger is above INFO."""
+        @log_execution_time
+        def add(a, b):
+            return a + b
+
+        with caplog_only.at_level(logging.WARNING, logger="mcp_tool"):
+            assert add(1, 2) == 3
+
+        assert caplog_only.records == []
+
+    @pytest.mark.asyncio
+    async def test_log_execution_time_async(self, caplog_only):
+        """Test that coroutine functions are timed across the await."""
+        @log_execution_time
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        with caplog_only.at_level(logging.INFO, logger="mcp_tool"):
+            assert await slow() == "done"
+
+        (record,) = caplog_only.records
+        assert record.status == "success"
+        assert record.execution_time >= 0.05
+        assert slow.__name__ == "slow"
+
+    def test_log_tool_execution(self, caplog_only):
+        """Test that tool executions are logged at INFO and skipped above it."""
+        with caplog_only.at_level(logging.WARNING, logger="mcp_tool"):
+            log_tool_execution("get_stock_info", {"ticker": "AAPL"}, {"name": "Apple"}, 0.1)
+        assert caplog_only.records == []
+
+        with caplog_only.at_level(logging.INFO, logger="mcp_tool"):
+            log_tool_execution("get_stock_info", {"ticker": "AAPL"}, {"name": "Apple"}, 0.1)
+
+        (record,) = caplog_only.records
+        assert record.extra_fields["tool_name"] == "get_stock_info"
+        assert record.extra_fields["input_data"] == {"ticker": "AAPL"}
+        assert record.extra_fields["status"] == "success"
+
+    def test_log_tool_execution_json_payload(self, caplog_only):
+        """Test that tool input and output reach the JSON log line, stringifying unknown types."""
+        with caplog_only.at_level(logging.INFO, logger="mcp_tool"):
+            log_tool_execution("t", {"amount": Decimal("1.50")}, {"rows": 2}, 0.1)
+
+        (record,) = caplog_only.records
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["message"] == "Tool t executed"
+        assert entry["input_data"] == {"amount": "1.50"}
+        assert entry["output_data"] == {"rows": 2}
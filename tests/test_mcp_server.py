@@ -6,176 +6,406 @@ This module contains tests for the MCP server functionality with yfinance tools.
 
 import json
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import numpy as np
+import pandas as pd
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-from mcp_server import mcp
+from mcp_server import mcp, clear_caches
+
+
+class FakeTicker:
+    """Stand-in for yfinance.Ticker that serves fixed data and counts lookups."""
+
+    def __init__(self, info=None, history=None, dividends=None):
+        self._info = info if info is not None else {}
+        self._history = history
+        self.dividends = dividends
+        self.info_calls = 0
+        self.history_calls = 0
+
+    @property
+    def info(self):
+        self.info_calls += 1
+        return self._info
+
+    @info.setter
+    def info(self, value):
+        self._info = value
+
+    def history(self, *args, **kwargs):
+        self.history_calls += 1
+        return self._history
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Start every test with empty Yahoo Finance caches."""
+    clear_caches()
+    yield
+    clear_caches()
+
+
+@pytest.fixture
+def ohlc_df():
+    """A year of synthetic daily OHLCV prices."""
+    rng = np.random.default_rng(7)
+    n = 250
+    close = 100 + np.cumsum(rng.standard_normal(n))
+    spread = np.abs(rng.standard_normal((n, 2)))
+    return pd.DataFrame(
+        {
+            "Open": close + rng.standard_normal(n) * 0.5,
+            "High": close + spread[:, 0],
+            "Low": close - spread[:, 1],
+            "Close": close,
+            "Volume": rng.integers(1_000_000, 5_000_000, n),
+        },
+        index=pd.date_range("2024-01-01", periods=n, freq="B", name="Date"),
+    )
+
+
+@pytest.fixture(scope="module")
+def yf_patch():
+    """Patch the yfinance module used by the server once for the whole module."""
+    with patch('mcp_server.yf') as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_yf(yf_patch):
+    """The shared yfinance patch, with calls and return values from earlier tests cleared."""
+    yf_patch.reset_mock(return_value=True, side_effect=True)
+    return yf_patch
 
 
 class TestMCPServer:
     """Test cases for MCP server yfinance tools."""
     
     @pytest.mark.asyncio
-    async def test_get_stock_info(self):
+    async def test_get_stock_info(self, mock_yf):
         """Test the get_stock_info tool function."""
         from mcp_server import get_stock_info
         
         # Mock yfinance.Ticker
-        with patch('mcp_server.yf') as mock_yf:
-            mock_ticker = MagicMock()
-            mock_ticker.info = {
-                "shortName": "Apple Inc.",
-                "sector": "Technology",
-                "industry": "Consumer Electronics",
-                "marketCap": 3000000000000,
-                "currentPrice": 200.0,
-                "trailingPE": 25.0,
-                "dividendYield": 0.5,
-                "fiftyTwoWeekHigh": 250.0,
-                "fiftyTwoWeekLow": 150.0
-            }
-            mock_yf.Ticker.return_value = mock_ticker
+        mock_yf.Ticker.return_value = FakeTicker({
+            "shortName": "Apple Inc.",
+            "sector": "Technology",
+            "industry": "Consumer Electronics",
+            "marketCap": 3000000000000,
+            "currentPrice": 200.0,
+            "trailingPE": 25.0,
+            "dividendYield": 0.5,
+            "fiftyTwoWeekHigh": 250.0,
+            "fiftyTwoWeekLow": 150.0
+        })
+        
+        # Test with valid ticker
+        result = await get_stock_info("AAPL")
+        result_data = json.loads(result)
+        
+        assert "ticker" in result_data
+        assert "name" in result_data
+        assert "sector" in result_data
+        assert "industry" in result_data
+        assert "market_cap" in result_data
+        assert "current_price" in result_data
+        assert "pe_ratio" in result_data
+        assert "dividend_yield" in result_data
+        assert "52_week_high" in result_data
+        assert "52_week_low" in result_data
+        assert result_data["ticker"] == "AAPL"
+        assert result_data["name"] == "Apple Inc."
+        assert result_data["sector"] == "Technology"
+    
+    @pytest.mark.asyncio
+    async def test_get_stock_info_rounding_and_price_fallback(self, mock_yf):
+        """Test numeric rounding and the regularMarketPrice fallback."""
+        from mcp_server import get_stock_info
+        
+        mock_yf.Ticker.return_value = FakeTicker({
+            "regularMarketPrice": 199.5,
+            "trailingPE": 31.123456789,
+        })
+        
+        result_data = json.loads(await get_stock_info("AAPL"))
+        
+        assert result_data["current_price"] == 199.5
+        assert result_data["pe_ratio"] == 31.1235
+        assert result_data["dividend_yield"] == "N/A"
+    
+    @pytest.mark.asyncio
+    async def test_get_stock_info_cached(self, mock_yf):
+        """Test that repeated get_stock_info calls reuse the cached Ticker info."""
+        from mcp_server import get_stock_info
+        
+        mock_ticker = FakeTicker({"shortName": "Apple Inc."})
+        mock_yf.Ticker.return_value = mock_ticker
+        
+        first = json.loads(await get_stock_info("AAPL"))
+        mock_ticker.info = {"shortName": "Changed"}
+        second = json.loads(await get_stock_info("AAPL"))
+        
+        assert first["name"] == "Apple Inc."
+        assert second["name"] == "Apple Inc."
+        assert mock_ticker.info_calls == 1
+        mock_yf.Ticker.assert_called_once()
+        assert mock_yf.Ticker.call_args.args == ("AAPL",)
+        
+        # Clearing the caches forces a fresh lookup
+        clear_caches()
+        third = json.loads(await get_stock_info("AAPL"))
+        assert third["name"] == "Changed"
+    
+    @pytest.mark.asyncio
+    async def test_get_stock_info_refetched_after_ttl(self, mock_yf):
+        """Test that an expired info entry is fetched again from a fresh Ticker."""
+        from mcp_server import get_stock_info, INFO_TTL
+        
+        mock_yf.Ticker.side_effect = [
+            FakeTicker({"shortName": "Apple Inc.", "currentPrice": 200.0}),
+            FakeTicker({"shortName": "Apple Inc.", "currentPrice": 201.0}),
+        ]
+        
+        with patch('mcp_server.time.monotonic', return_value=1000.0):
+            first = json.loads(await get_stock_info("AAPL"))
+        with patch('mcp_server.time.monotonic', return_value=1000.0 + INFO_TTL):
+            second = json.loads(await get_stock_info("AAPL"))
+        
+        assert first["current_price"] == 200.0
+        assert second["current_price"] == 201.0
+        assert mock_yf.Ticker.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_stock_info_cache_ignores_case(self, mock_yf):
+        """Test that differently cased tickers share one cache entry and one fetch."""
+        from mcp_server import get_stock_info
+        
+        mock_yf.Ticker.return_value = FakeTicker({"shortName": "Apple Inc."})
+        
+        lower = json.loads(await get_stock_info("aapl"))
+        upper = json.loads(await get_stock_info("AAPL"))
+        
+        assert lower["ticker"] == "aapl"
+        assert lower["name"] == upper["name"] == "Apple Inc."
+        mock_yf.Ticker.assert_called_once()
+        assert mock_yf.Ticker.call_args.args == ("AAPL",)
+    
+    @pytest.mark.asyncio
+    async def test_info_cache_is_bounded(self, mock_yf):
+        """Test that the info cache evicts expired entries and stays within its size cap."""
+        from mcp_server import get_stock_info, INFO_TTL, _INFO_CACHE
+        
+        mock_yf.Ticker.return_value = FakeTicker({"shortName": "Some Corp"})
+        
+        with patch('mcp_server.CACHE_MAX_ENTRIES', 2):
+            with patch('mcp_server.time.monotonic', return_value=1000.0):
+                for ticker in ("AAA", "BBB", "CCC"):
+                    await get_stock_info(ticker)
+            assert list(_INFO_CACHE) == ["BBB", "CCC"]
             
-            # Test with valid ticker
-            result = await get_stock_info("AAPL")
-            result_data = json.loads(result)
+            # Storing a new entry once the others have expired drops them too
+            with patch('mcp_server.time.monotonic', return_value=1000.0 + INFO_TTL):
+                await get_stock_info("DDD")
+            assert list(_INFO_CACHE) == ["DDD"]
+    
+    @pytest.mark.asyncio
+    async def test_get_stock_info_unknown_ticker_cached(self, mock_yf):
+        """Test that unknown tickers fail fast on repeated lookups."""
+        from mcp_server import get_stock_info
+        
+        mock_ticker = FakeTicker({"trailingPegRatio": None})
+        mock_yf.Ticker.return_value = mock_ticker
+        
+        first = json.loads(await get_stock_info("BOGUS"))
+        second = json.loads(await get_stock_info("BOGUS"))
+        
+        assert "Unknown ticker: BOGUS" in first["error"]
+        assert "Unknown ticker: BOGUS" in second["error"]
+        assert mock_ticker.info_calls == 1
+    
+    @pytest.mark.asyncio
+    async def test_unknown_ticker_cache_expires_and_is_bounded(self, mock_yf):
+        """Test that unknown tickers are forgotten after NEGATIVE_TTL and capped in number."""
+        from mcp_server import get_stock_info, NEGATIVE_TTL, _NEGATIVE_CACHE
+        
+        mock_ticker = FakeTicker({})
+        mock_yf.Ticker.return_value = mock_ticker
+        
+        with patch('mcp_server.CACHE_MAX_ENTRIES', 2):
+            with patch('mcp_server.time.monotonic', return_value=1000.0):
+                for ticker in ("BAD1", "BAD2", "BAD3"):
+                    await get_stock_info(ticker)
+            assert list(_NEGATIVE_CACHE) == ["BAD2", "BAD3"]
             
-            assert "ticker" in result_data
-            assert "name" in result_data
-            assert "sector" in result_data
-            assert "industry" in result_data
-            assert "market_cap" in result_data
-            assert "current_price" in result_data
-            assert "pe_ratio" in result_data
-            assert "dividend_yield" in result_data
-            assert "52_week_high" in result_data
-            assert "52_week_low" in result_data
-            assert result_data["ticker"] == "AAPL"
-            assert result_data["name"] == "Apple Inc."
-            assert result_data["sector"] == "Technology"
-    
-    @pytest.mark.asyncio
-    async def test_get_historical_data(self):
+            # An expired entry is dropped and the ticker looked up again
+            with patch('mcp_server.time.monotonic', return_value=1000.0 + NEGATIVE_TTL):
+                await get_stock_info("BAD2")
+            assert mock_ticker.info_calls == 4
+            assert list(_NEGATIVE_CACHE) == ["BAD2"]
+    
+    @pytest.mark.asyncio
+    async def test_get_historical_data(self, mock_yf, ohlc_df):
         """Test the get_historical_data tool."""
         from mcp_server import get_historical_data
         
-        # Mock yfinance.Ticker and history
-        with patch('mcp_server.yf') as mock_yf:
-            mock_ticker = MagicMock()
-            mock_history = MagicMock()
-            mock_history.empty = False
-            
-            # Mock basic pandas operations
-            mock_history.__len__.return_value = 10
-            mock_history["Low"].min.return_value = 95.0
-            mock_history["High"].max.return_value = 125.0
-            mock_history["Volume"].mean.return_value = 1000000
-            
-            # Mock the sample data creation
-            mock_sample = MagicMock()
-            mock_sample.reset_index.return_value = MagicMock()
-            mock_sample.reset_index.return_value.to_dict.return_value = {"records": []}
-            mock_history.iloc.__getitem__.return_value = mock_sample
-            
-            mock_ticker.history.return_value = mock_history
-            mock_yf.Ticker.return_value = mock_ticker
-            
-            # Test with valid parameters
-            result = await get_historical_data("AAPL", "1y", "1d")
-            result_data = json.loads(result)
-            
-            # Just test that we get a result (even if it's an error due to mocking complexity)
-            assert isinstance(result_data, dict)
-            # The function should return something, even if it's an error due to complex pandas operations
-            assert len(result_data) > 0
+        # Mock yfinance.Ticker and serve a real OHLCV history
+        mock_ticker = FakeTicker(history=ohlc_df)
+        mock_yf.Ticker.return_value = mock_ticker
+        
+        # Test with valid parameters
+        result = await get_historical_data("AAPL", "1y", "1d")
+        result_data = json.loads(result)
+        
+        stats = result_data["stats"]
+        close = ohlc_df["Close"]
+        assert result_data["ticker"] == "AAPL"
+        assert stats["start_date"] == "2024-01-01"
+        assert stats["end_date"] == ohlc_df.index[-1].strftime("%Y-%m-%d")
+        assert stats["start_price"] == round(close.iloc[0], 2)
+        assert stats["end_price"] == round(close.iloc[-1], 2)
+        assert stats["min_price"] == round(ohlc_df["Low"].min(), 2)
+        assert stats["max_price"] == round(ohlc_df["High"].max(), 2)
+        assert stats["price_change_pct"] == round((close.iloc[-1] / close.iloc[0] - 1) * 100, 2)
+        assert stats["avg_volume"] == round(ohlc_df["Volume"].mean(), 2)
+        
+        # Sampled down to 30 evenly spaced rows, keeping both endpoints
+        sample = result_data["sample_data"]
+        assert len(sample) == 30
+        assert sample[0]["Close"] == close.iloc[0]
+        assert sample[-1]["Close"] == close.iloc[-1]
+        assert set(sample[0]) == {"Date", "Open", "High", "Low", "Close", "Volume"}
+        assert mock_ticker.history_calls == 1
     
     @pytest.mark.asyncio
-    async def test_get_historical_data_empty(self):
+    async def test_get_historical_data_empty(self, mock_yf):
         """Test the get_historical_data tool with empty data."""
         from mcp_server import get_historical_data
         
-        # Mock yfinance.Ticker and history
-        with patch('mcp_server.yf') as mock_yf:
-            mock_ticker = MagicMock()
-            mock_history = MagicMock()
-            mock_history.empty = True
-            
-            mock_ticker.history.return_value = mock_history
-            mock_yf.Ticker.return_value = mock_ticker
-            
-            # Test with empty data
-            result = await get_historical_data("INVALID", "1y", "1d")
-            result_data = json.loads(result)
-            
-            assert "error" in result_data
-            assert "No historical data available" in result_data["error"]
+        # Mock yfinance.Ticker with an empty history
+        mock_yf.Ticker.return_value = FakeTicker(history=pd.DataFrame())
+        
+        # Test with empty data
+        result = await get_historical_data("INVALID", "1y", "1d")
+        result_data = json.loads(result)
+        
+        assert "error" in result_data
+        assert "No historical data available" in result_data["error"]
     
     @pytest.mark.asyncio
-    async def test_get_dividends(self):
+    async def test_get_dividends(self, mock_yf):
         """Test the get_dividends tool."""
         from mcp_server import get_dividends
         
         # Mock yfinance.Ticker and dividends
-        with patch('mcp_server.yf') as mock_yf:
-            mock_ticker = MagicMock()
-            mock_dividends = MagicMock()
-            mock_dividends.empty = False
-            mock_dividends.tail.return_value = MagicMock()
-            mock_dividends.tail.return_value.sum.return_value = 4.0
-            mock_ticker.dividends = mock_dividends
-            mock_ticker.info = {"currentPrice": 200.0}
-            mock_yf.Ticker.return_value = mock_ticker
-            
-            # Test with valid ticker
-            result = await get_dividends("AAPL")
-            result_data = json.loads(result)
-            
-            assert "ticker" in result_data
-            assert "has_dividends" in result_data
-            assert "dividend_yield_percent" in result_data
-            assert "ttm_dividend" in result_data
-            assert "current_price" in result_data
-            assert result_data["ticker"] == "AAPL"
-            assert result_data["has_dividends"] is True
+        mock_yf.Ticker.return_value = FakeTicker(
+            {"currentPrice": 200.0},
+            dividends=pd.Series([1.0] * 4, index=pd.date_range("2024-01-15", periods=4, freq="QS")),
+        )
+        
+        # Test with valid ticker
+        result = await get_dividends("AAPL")
+        result_data = json.loads(result)
+        
+        assert "ticker" in result_data
+        assert "has_dividends" in result_data
+        assert "dividend_yield_percent" in result_data
+        assert "ttm_dividend" in result_data
+        assert "current_price" in result_data
+        assert result_data["ticker"] == "AAPL"
+        assert result_data["has_dividends"] is True
+        assert result_data["ttm_dividend"] == 4.0
+        assert result_data["dividend_yield_percent"] == 2.0
     
     @pytest.mark.asyncio
-    async def test_compare_stocks(self):
+    async def test_get_dividends_history_order(self, mock_yf):
+        """Test that get_dividends returns the 8 most recent dividends, newest first."""
+        from mcp_server import get_dividends
+        
+        mock_yf.Ticker.return_value = FakeTicker(
+            {"currentPrice": 100.0},
+            dividends=pd.Series(
+                [0.20 + 0.01 * i for i in range(12)],
+                index=pd.date_range("2022-01-15", periods=12, freq="QS"),
+            ),
+        )
+        
+        result_data = json.loads(await get_dividends("AAPL"))
+        history = result_data["dividend_history"]
+        
+        assert len(history) == 8
+        assert history[0]["amount"] == pytest.approx(0.31)
+        assert history[-1]["amount"] == pytest.approx(0.24)
+        assert [item["date"] for item in history] == sorted(
+            (item["date"] for item in history), reverse=True
+        )
+        assert result_data["ttm_dividend"] == pytest.approx(0.28 + 0.29 + 0.30 + 0.31)
+    
+    @pytest.mark.asyncio
+    async def test_compare_stocks(self, mock_yf):
         """Test the compare_stocks tool."""
         from mcp_server import compare_stocks
         
-        # Mock yfinance.Ticker
-        with patch('mcp_server.yf') as mock_yf:
-            mock_ticker = MagicMock()
-            mock_ticker.info = {
-                "shortName": "Apple Inc.",
-                "sector": "Technology",
-                "marketCap": 3000000000000,
-                "currentPrice": 200.0,
-                "trailingPE": 25.0,
-                "dividendYield": 0.5,
-                "fiftyTwoWeekHigh": 250.0,
-                "fiftyTwoWeekLow": 150.0
-            }
-            mock_history = MagicMock()
-            mock_history.empty = False
-            mock_history["Close"].iloc = [100.0, 120.0]
-            mock_ticker.history.return_value = mock_history
-            mock_yf.Ticker.return_value = mock_ticker
-            
-            # Test with valid tickers
-            result = await compare_stocks(["AAPL", "MSFT"], "1y")
-            result_data = json.loads(result)
-            
-            assert "tickers" in result_data
-            assert "period" in result_data
-            assert "comparison" in result_data
-            assert "AAPL" in result_data["comparison"]
-            assert "MSFT" in result_data["comparison"]
-            assert result_data["tickers"] == ["AAPL", "MSFT"]
-            assert result_data["period"] == "1y"
+        # Mock yfinance.Ticker and the batched yfinance.download
+        mock_yf.Ticker.return_value = FakeTicker({
+            "shortName": "Apple Inc.",
+            "sector": "Technology",
+            "marketCap": 3000000000000,
+            "currentPrice": 200.0,
+            "trailingPE": 25.0,
+            "dividendYield": 0.5,
+            "fiftyTwoWeekHigh": 250.0,
+            "fiftyTwoWeekLow": 150.0
+        })
+        mock_yf.download.return_value = pd.DataFrame(
+            {
+                ("AAPL", "Close"): [100.0, 120.0],
+                ("MSFT", "Close"): [200.0, 150.0],
+            },
+            index=pd.to_datetime(["2024-01-02", "2024-12-31"]),
+        )
+        
+        # Test with valid tickers
+        result = await compare_stocks(["AAPL", "MSFT"], "1y")
+        result_data = json.loads(result)
+        
+        assert "tickers" in result_data
+        assert "period" in result_data
+        assert "comparison" in result_data
+        assert "AAPL" in result_data["comparison"]
+        assert "MSFT" in result_data["comparison"]
+        assert result_data["tickers"] == ["AAPL", "MSFT"]
+        assert result_data["period"] == "1y"
+        assert result_data["comparison"]["AAPL"]["price_change_pct"] == 20.0
+        assert result_data["comparison"]["MSFT"]["price_change_pct"] == -25.0
+        
+        # Both histories come from a single batched download
+        mock_yf.download.assert_called_once()
+        
+        # A warm call is served from the cache
+        await compare_stocks(["AAPL", "MSFT"], "1y")
+        mock_yf.download.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_compare_stocks_lower_case_ticker(self, mock_yf, ohlc_df):
+        """Test that lower-case tickers match yf.download's upper-cased columns."""
+        from mcp_server import compare_stocks, get_historical_data
+        
+        mock_ticker = FakeTicker({"shortName": "Apple Inc."}, history=ohlc_df)
+        mock_yf.Ticker.return_value = mock_ticker
+        mock_yf.download.return_value = pd.DataFrame(
+            {("AAPL", "Close"): [100.0, 110.0]},
+            index=pd.to_datetime(["2024-01-02", "2024-12-31"]),
+        )
+        
+        result_data = json.loads(await compare_stocks(["aapl"], "1y"))
+        
+        assert result_data["comparison"]["aapl"]["price_change_pct"] == 10.0
+        assert mock_yf.download.call_args.args[0] == ["AAPL"]
+        
+        # The downloaded frame is not served as the Ticker.history result
+        history_data = json.loads(await get_historical_data("AAPL", "1y", "1d"))
+        assert history_data["stats"]["start_date"] == "2024-01-01"
+        assert mock_ticker.history_calls == 1
     
     @pytest.mark.asyncio
     async def test_calculate_correlation(self):
@@ -183,8 +413,8 @@ class TestMCPServer:
         from mcp_server import calculate_correlation
         
         # Test with valid data
-        series1 = [1, 2, 3, 4, 5]
-        series2 = [2, 4, 6, 8, 10]
+        series1 = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+        series2 = np.array([2.0, 4.0, 6.0, 8.0, 10.0])
         result = await calculate_correlation(series1, series2)
         result_data = json.loads(result)
         
@@ -196,13 +426,66 @@ class TestMCPServer:
         assert result_data["correlation"] == 1.0  # Perfect correlation
         assert "mean" in result_data["series1_stats"]
         assert "std" in result_data["series1_stats"]
+        
+        # Plain lists, as sent by MCP clients, give the same result
+        assert json.loads(await calculate_correlation(series1.tolist(), series2.tolist())) == result_data
+    
+    @pytest.mark.asyncio
+    async def test_calculate_correlation_large_series(self):
+        """Test that the JIT path for large series matches NumPy."""
+        from mcp_server import calculate_correlation, CORRELATION_JIT_THRESHOLD
+        
+        rng = np.random.default_rng(42)
+        series1 = rng.random(CORRELATION_JIT_THRESHOLD * 2) * 100 + 1000
+        series2 = 0.5 * series1 + rng.random(series1.shape[0])
+        result = await calculate_correlation(series1, series2)
+        result_data = json.loads(result)
+        
+        assert result_data["series_length"] == len(series1)
+        assert result_data["correlation"] == round(np.corrcoef(series1, series2)[0, 1], 4)
+        assert result_data["series1_stats"]["mean"] == round(np.mean(series1), 4)
+        assert result_data["series2_stats"]["std"] == round(np.std(series2), 4)
+    
+    @pytest.mark.asyncio
+    async def test_calculate_correlation_kernel_off_event_loop(self):
+        """Test that the JIT kernel is loaded and run on a worker thread, not the event loop."""
+        import threading
+        from mcp_server import calculate_correlation, CORRELATION_JIT_THRESHOLD, _get_pearson_kernel
+        
+        kernel = _get_pearson_kernel()
+        threads = []
+        
+        def load_kernel():
+            threads.append(threading.current_thread())
+            return kernel
+        
+        series = np.arange(CORRELATION_JIT_THRESHOLD, dtype=np.float64)
+        with patch('mcp_server._get_pearson_kernel', side_effect=load_kernel):
+            result_data = json.loads(await calculate_correlation(series, series))
+        
+        assert result_data["correlation"] == 1.0
+        assert threads and threads[0] is not threading.main_thread()
+    
+    @pytest.mark.asyncio
+    async def test_calculate_correlation_read_only_arrays(self):
+        """Test that read-only arrays (e.g. from Series.to_numpy()) work on the JIT path."""
+        from mcp_server import calculate_correlation, CORRELATION_JIT_THRESHOLD
+        
+        series1 = np.linspace(0.0, 1.0, CORRELATION_JIT_THRESHOLD * 2)
+        series2 = series1 ** 2
+        series1.setflags(write=False)
+        series2.setflags(write=False)
+        result_data = json.loads(await calculate_correlation(series1, series2))
+        
+        assert "error" not in result_data
+        assert result_data["correlation"] == round(np.corrcoef(series1, series2)[0, 1], 4)
     
     @pytest.mark.asyncio
     async def test_calculate_correlation_different_lengths(self):
         """Test correlation analyzer with different length series."""
         from mcp_server import calculate_correlation
         
-        result = await calculate_correlation([1, 2, 3], [1, 2])
+        result = await calculate_correlation(np.array([1.0, 2.0, 3.0]), np.array([1.0, 2.0]))
         result_data = json.loads(result)
         
         assert "error" in result_data
@@ -232,6 +515,14 @@ class TestMCPServer:
         for tool in expected_tools:
             assert tool in tools
     
+    def test_tool_registry_frozen(self):
+        """Test that the frozen tool registry mirrors the registered tools."""
+        from mcp_server import TOOL_REGISTRY
+        
+        assert dict(TOOL_REGISTRY) == mcp._tool_manager._tools
+        with pytest.raises(TypeError):
+            TOOL_REGISTRY["new_tool"] = None
+    
     def test_mcp_server_tool_descriptions(self):
         """Test that tools have proper descriptions."""
         for tool_name, tool in mcp._tool_manager._tools.items():